@@ -0,0 +1,82 @@
+import math
+from functools import lru_cache
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    # Numba is optional; callers fall back to the vectorized numpy path
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Squared speed below which a rocket without fuel is treated as at rest
+REST_SPEED_SQ = 1e-12
+
+
+@lru_cache(maxsize=None)
+def make_step_population(length, damping, max_v):
+    """
+    Build a step kernel specialized for one DNA length and physics config.
+
+    The arguments are baked into the compiled kernel as constants, which
+    lets LLVM fold the bounds check and the speed clamp. Kernels are cached,
+    so each configuration is compiled once.
+
+    Args:
+        length: Number of thrust instructions per rocket
+        damping: Velocity multiplier applied every step
+        max_v: Maximum speed
+
+    Returns:
+        Kernel called as ``step(dna, pos, vel, step, active_idx)``
+    """
+    max_v2 = max_v * max_v
+
+    @njit(parallel=True, fastmath=True)
+    def step_population(dna, pos, vel, step, active_idx):
+        """
+        Advance the active rockets by one simulation step in place.
+
+        Applies the current DNA instruction (or no thrust once out of fuel),
+        integrates velocity with damping, clamps the speed to ``max_v`` and
+        moves each rocket. Rockets that are out of fuel and at rest are
+        skipped. Thrust is read straight from the DNA and all arithmetic
+        stays in scalar registers, so no per-rocket arrays are materialized.
+
+        Args:
+            dna: Thrust vectors of shape (N, length, 2)
+            pos: Positions of shape (N, 2)
+            vel: Velocities of shape (N, 2)
+            step: Index of the next DNA instruction per rocket, shape (N,)
+            active_idx: Compact indices of the rockets to advance
+        """
+        for k in prange(active_idx.size):
+            i = active_idx[k]
+            ax = 0.0
+            ay = 0.0
+            if step[i] < length:
+                ax = dna[i, step[i], 0]
+                ay = dna[i, step[i], 1]
+                step[i] += 1
+            elif vel[i, 0] * vel[i, 0] + vel[i, 1] * vel[i, 1] < REST_SPEED_SQ:
+                # Out of fuel and practically at rest: nothing left to integrate
+                continue
+            vx = (vel[i, 0] + ax) * damping
+            vy = (vel[i, 1] + ay) * damping
+            m2 = vx * vx + vy * vy
+            if m2 > max_v2:
+                s = max_v / math.sqrt(m2)
+                vx *= s
+                vy *= s
+            vel[i, 0] = vx
+            vel[i, 1] = vy
+            pos[i, 0] += vx
+            pos[i, 1] += vy
+
+    return step_population
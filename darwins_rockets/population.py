@@ -1,99 +1,364 @@
-import random
-from darwins_rockets.rocket import Rocket
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from darwins_rockets.rocket import RocketConfig
+from darwins_rockets.state import PopulationState, compute_fitness
+from darwins_rockets._kernels import HAS_NUMBA, make_step_population
 import math
 import numpy as np
 from config import GENE_MIN_MAGNITUDE, GENE_MAX_MAGNITUDE
 
+# Shared generator for DNA operations called without an explicit rng
+_RNG = np.random.default_rng()
+
 # --- DNA class for modular genetic operations ---
 class DNA:
     def __init__(self, genes):
-        self.genes = genes  # List of numpy arrays
+        self.genes = np.asarray(genes)  # Array of thrust vectors, shape (L, 2)
 
     @staticmethod
-    def random_gene():
-        angle = random.uniform(0, 2 * math.pi)
-        magnitude = random.uniform(GENE_MIN_MAGNITUDE, GENE_MAX_MAGNITUDE)
-        return np.array([magnitude * math.cos(angle), magnitude * math.sin(angle)], dtype=float)
+    def random_batch(n, length, lo=GENE_MIN_MAGNITUDE, hi=GENE_MAX_MAGNITUDE, rng=None):
+        """
+        Generate random thrust vectors for many DNA sequences at once.
+
+        Args:
+            n: Number of DNA sequences
+            length: Number of genes per sequence
+            lo: Minimum thrust magnitude
+            hi: Maximum thrust magnitude
+            rng: numpy Generator to draw from (module default if None)
+
+        Returns:
+            np.ndarray: Genes of shape (n, length, 2)
+        """
+        rng = _RNG if rng is None else rng
+        # Draw straight into float32 so no float64 temporaries are created
+        angles = rng.random((n, length), dtype=np.float32) * np.float32(2 * math.pi)
+        magnitudes = np.float32(lo) + rng.random((n, length), dtype=np.float32) * np.float32(hi - lo)
+        return np.stack([magnitudes * np.cos(angles), magnitudes * np.sin(angles)], -1)
 
     @classmethod
-    def random(cls, length):
-        return cls([cls.random_gene() for _ in range(length)])
+    def random(cls, length, rng=None):
+        return cls(cls.random_batch(1, length, rng=rng)[0])
 
-    def crossover(self, other):
-        point = random.randint(0, len(self.genes) - 1)
-        child_genes = self.genes[:point] + other.genes[point:]
+    def crossover(self, other, rng=None):
+        rng = _RNG if rng is None else rng
+        point = rng.integers(0, len(self.genes))
+        child_genes = np.concatenate([self.genes[:point], other.genes[point:]])
         return DNA(child_genes)
 
-    def mutate(self, mutation_rate):
-        new_genes = []
-        for gene in self.genes:
-            if random.random() < mutation_rate:
-                new_genes.append(DNA.random_gene())
-            else:
-                new_genes.append(gene.copy())
-        return DNA(new_genes)
+    def mutate(self, mutation_rate, rng=None):
+        return DNA(DNA.mutate_batch(self.genes[None], mutation_rate, rng)[0])
+
+    @staticmethod
+    def mutate_batch(genes, mutation_rate, rng=None):
+        """
+        Replace each gene with a fresh random one with probability mutation_rate.
+
+        Args:
+            genes: Genes of shape (n, length, 2)
+            mutation_rate: Probability of gene mutation (0.0 to 1.0)
+            rng: numpy Generator to draw from (module default if None)
+
+        Returns:
+            np.ndarray: Mutated copy of the genes
+        """
+        rng = _RNG if rng is None else rng
+        n, length = genes.shape[:2]
+        mask = rng.random((n, length), dtype=np.float32) < mutation_rate
+        fresh = DNA.random_batch(n, length, rng=rng)
+        return np.where(mask[..., None], fresh, genes)
 
-    def to_list(self):
-        return [g.copy() for g in self.genes]
 
 class Population:
-    def __init__(self, start_positions, dna_length, mutation_rate):
+    # Minimum estimated work (rockets x per-rocket cost) before fitness
+    # evaluation is worth shipping to worker processes
+    PARALLEL_FITNESS_THRESHOLD = 100_000
+
+    def __init__(self, start_positions, dna_length, mutation_rate, config=None, seed=None):
         self.start_positions = start_positions
         self.dna_length = dna_length
         self.mutation_rate = mutation_rate
-        self.dnas = [DNA.random(self.dna_length) for _ in start_positions]
+        self.config = config or RocketConfig()
+        # One vectorized generator for every random draw of the GA
+        self.rng = np.random.default_rng(seed)
+        self.dna = DNA.random_batch(len(start_positions), self.dna_length, rng=self.rng)
+        self.state = None
+        self.active_idx = None
+        self.spawn()
+
+    def spawn(self):
+        """
+        Reset the struct-of-arrays state from the current DNA so a new
+        generation starts at rest on the start positions.
+
+        Returns:
+            PopulationState: The freshly allocated state
+        """
+        self.state = PopulationState.allocate(
+            self.start_positions, self.dna, self.config.MAX_TRAIL_LENGTH
+        )
+        self.active_idx = np.arange(self.state.size, dtype=np.int32)
+        return self.state
+
+    def step_all(self, world):
+        """
+        Advance every active rocket by one simulation step.
+
+        Args:
+            world: The simulation world containing boundaries and obstacles
+        """
+        state = self.state
+        damping = self.config.VELOCITY_DAMPING
+        max_velocity = self.config.MAX_VELOCITY
+
+        # Drop rockets deactivated since the last step so only live rows are visited
+        idx = self.active_idx = self.active_idx[state.active[self.active_idx]]
+
+        if HAS_NUMBA:
+            # Single fused compiled loop over the active rockets, specialized
+            # for this population's DNA length and physics constants
+            step = make_step_population(state.dna_length, damping, max_velocity)
+            step(state.dna, state.pos, state.vel, state.current_step, idx)
+            state.push_trail(idx)
+            return
+
+        # Apply the current DNA instruction, or no thrust once out of fuel
+        has_fuel = state.current_step[idx] < state.dna_length
+        fueled = idx[has_fuel]
+        thrust = np.zeros((idx.size, 2), dtype=np.float32)
+        thrust[has_fuel] = state.dna[fueled, state.current_step[fueled]]
+        state.current_step[fueled] += 1
+
+        # Integrate velocity with damping and clamp the speed
+        vel = (state.vel[idx] + thrust) * damping
+        speed_sq = np.einsum('ij,ij->i', vel, vel)
+        too_fast = speed_sq > max_velocity * max_velocity
+        vel[too_fast] *= (max_velocity / np.sqrt(speed_sq[too_fast]))[:, None]
+        state.vel[idx] = vel
+
+        # Update positions and trails
+        state.pos[idx] += vel
+        state.push_trail(idx)
+
+    def should_continue(self):
+        """
+        Check whether stepping the population can still change anything
+        driven by the DNA.
+
+        Returns:
+            bool: False once every rocket is out of fuel or inactive
+        """
+        state = self.state
+        return bool((state.current_step < state.dna_length).any() and state.active.any())
+
+    def evaluate_fitness(self, target_pos, rows=slice(None)):
+        """
+        Calculate the fitness of the rockets in a single vectorized pass.
+
+        Args:
+            target_pos: Target position as (x, y) tuple
+            rows: Rockets to evaluate (all by default)
+
+        Returns:
+            np.ndarray: Fitness of each rocket
+        """
+        # Convert the target once for the whole population
+        target = np.asarray(target_pos, dtype=np.float32)
+        self.state.evaluate_fitness(
+            target,
+            self.config.TARGET_RADIUS,
+            self.config.FITNESS_TARGET_REWARD,
+            self.config.FITNESS_BONUS_PER_STEP,
+            rows
+        )
+        return self.state.fitness
+
+    def evaluate_parallel(self, rockets, target_pos, pool=None, cost_per_rocket=1.0):
+        """
+        Evaluate fitness in worker processes (master-slave model).
+
+        Selection, crossover and mutation stay in this process. Cheap fitness
+        functions are evaluated serially because the process overhead would
+        outweigh the work.
+
+        Args:
+            rockets: Rockets to evaluate
+            target_pos: Target position as (x, y) tuple
+            pool: Executor to use (a temporary ProcessPoolExecutor if None).
+                A process pool must not use the fork start method: forking
+                after the Numba kernel's threading layer has started hangs
+                the workers.
+            cost_per_rocket: Relative cost of evaluating one rocket
+
+        Returns:
+            np.ndarray: Fitness of each rocket, in the order given
+        """
+        rows = np.array([rocket.index for rocket in rockets], dtype=np.intp)
+        if len(rows) * cost_per_rocket < self.PARALLEL_FITNESS_THRESHOLD:
+            return self.evaluate_fitness(target_pos, rows)[rows]
+
+        state = self.state
+        target = np.asarray(target_pos, dtype=np.float32)
+        workers = os.cpu_count() or 1
+        chunk_size = max(1, len(rows) // (4 * workers))
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        config = self.config
+        args = (
+            [state.pos[c] for c in chunks],
+            [state.current_step[c] for c in chunks],
+            [state.has_reached_target[c] for c in chunks],
+            [state.target_reached_step[c] for c in chunks],
+            [state.dna_length] * len(chunks),
+            [target] * len(chunks),
+            [config.TARGET_RADIUS] * len(chunks),
+            [config.FITNESS_TARGET_REWARD] * len(chunks),
+            [config.FITNESS_BONUS_PER_STEP] * len(chunks),
+        )
+
+        if pool is None:
+            # Spawn fresh workers; forking a process that already ran the
+            # parallel Numba kernel deadlocks in its threading layer
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(mp_context=context) as executor:
+                results = list(executor.map(compute_fitness, *args))
+        else:
+            results = list(pool.map(compute_fitness, *args))
+
+        for chunk, result in zip(chunks, results):
+            state.store_fitness(chunk, result)
+        return state.fitness[rows]
+
+    def snapshot(self):
+        """
+        Get the whole population state for visualization or analysis.
+
+        The arrays are views into the live state rather than per-rocket
+        dictionaries, so callers must copy anything they want to keep.
+
+        Returns:
+            dict: Population-wide arrays keyed like Rocket.get_state()
+        """
+        state = self.state
+        return {
+            'pos': state.pos,
+            'vel': state.vel,
+            'fitness': state.fitness,
+            'trail': state.trail,
+            'trail_head': state.trail_head,
+            'trail_count': state.trail_count,
+            'is_active': state.active,
+            'has_reached_target': state.has_reached_target,
+            'current_step': state.current_step,
+            'dna_length': state.dna_length,
+        }
 
     def get_fitness_sum(self, rockets):
         return sum(rocket.fitness for rocket in rockets)
 
-    def _get_normalized_fitnesses(self, rockets):
-        fitnesses = [rocket.fitness for rocket in rockets]
-        min_fitness = min(fitnesses) if fitnesses else 0
-        max_fitness = max(fitnesses) if fitnesses else 1
-        if max_fitness > min_fitness:
-            return [(f - min_fitness) / (max_fitness - min_fitness) for f in fitnesses]
-        else:
-            return [1.0] * len(fitnesses)
+    def _get_normalized_fitnesses(self, fitnesses):
+        """Min-max normalize fitnesses to [0, 1]; all ones if they are equal."""
+        fitnesses = np.asarray(fitnesses, dtype=np.float32)
+        if fitnesses.size == 0:
+            return fitnesses
+        spread = np.ptp(fitnesses)
+        if spread > 0:
+            return (fitnesses - fitnesses.min()) / spread
+        return np.ones_like(fitnesses)
 
     def normalize_fitness_for_selection(self, rockets):
-        normalized_fitnesses = self._get_normalized_fitnesses(rockets)
+        fitnesses = [rocket.fitness for rocket in rockets]
+        normalized_fitnesses = self._get_normalized_fitnesses(fitnesses)
         for rocket, norm in zip(rockets, normalized_fitnesses):
             rocket.fitness = norm
 
-    def roulette_wheel_select(self, rockets):
-        if not rockets:
-            return None
-        normalized_fitnesses = self._get_normalized_fitnesses(rockets)
-        fitness_sum = sum(normalized_fitnesses)
-        if fitness_sum == 0:
-            return random.randint(0, len(rockets) - 1)
-        pick = random.uniform(0, fitness_sum)
-        current = 0
-        for i, rocket in enumerate(rockets):
-            current += normalized_fitnesses[i]
-            if current >= pick:
-                return i
-        return len(rockets) - 1
-
-    def next_generation(self, rockets):
-        new_dnas = []
+    def _build_cdf(self, normalized_fitnesses):
+        """
+        Build the cumulative normalized fitness used for parent selection.
+
+        Args:
+            normalized_fitnesses: Fitnesses already normalized for this generation
+
+        Returns:
+            np.ndarray: Cumulative sum of the normalized fitnesses
+        """
+        # Accumulate in float64 so the tail of a large CDF keeps its resolution
+        return np.cumsum(normalized_fitnesses, dtype=np.float64)
+
+    def sus_select(self, cdf, k):
+        """
+        Draw k parents by stochastic universal sampling: one random offset
+        and k equally spaced pointers into the fitness CDF.
+
+        Args:
+            cdf: Cumulative normalized fitness from _build_cdf
+            k: Number of parents to draw
+
+        Returns:
+            np.ndarray: Positions of the selected rockets, in ascending order
+        """
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        if cdf[-1] <= 0:
+            return np.sort(self.rng.integers(0, len(cdf), k))
+        step = cdf[-1] / k
+        pointers = (self.rng.random() + np.arange(k)) * step
+        return np.minimum(np.searchsorted(cdf, pointers), len(cdf) - 1)
+
+    def reproduce(self, parent_indices_a, parent_indices_b):
+        """
+        Create one child per parent pair with single-point crossover and
+        mutation, all as batched array operations.
+
+        Args:
+            parent_indices_a: Rows of the current generation supplying the genes
+                before each cut point
+            parent_indices_b: Rows of the current generation supplying the genes
+                from each cut point on
+
+        Returns:
+            np.ndarray: Child genes of shape (len(parent_indices_a), L, 2)
+        """
+        dna = self.state.dna
+        n = len(parent_indices_a)
+        cut = self.rng.integers(0, self.dna_length, n)
+        from_a = np.arange(self.dna_length) < cut[:, None]
+        child = np.where(from_a[..., None], dna[parent_indices_a], dna[parent_indices_b])
+        return DNA.mutate_batch(child, self.mutation_rate, self.rng)
+
+    def next_generation(self, rockets, elite_k=1):
+        """
+        Evolve the DNA for the next generation.
+
+        The elite_k fittest rockets are carried over unchanged; the rest of
+        the generation is bred by selection, crossover and mutation.
+
+        Args:
+            rockets: Rockets of the finished generation
+            elite_k: Number of best rockets copied over unchanged
+        """
         if not rockets:
             # If no rockets, generate random DNA for all
-            for _ in self.start_positions:
-                new_dnas.append(DNA.random(self.dna_length))
-            self.dnas = new_dnas
+            self.dna = DNA.random_batch(len(self.start_positions), self.dna_length, rng=self.rng)
             return
-        for _ in self.start_positions:
-            idx1 = self.roulette_wheel_select(rockets)
-            idx2 = self.roulette_wheel_select(rockets)
-            if idx1 is None or idx2 is None:
-                child_dna = DNA.random(self.dna_length)
-            else:
-                dna1 = DNA(rockets[idx1].get_dna_copy())
-                dna2 = DNA(rockets[idx2].get_dna_copy())
-                child_dna = dna1.crossover(dna2).mutate(self.mutation_rate)
-            new_dnas.append(child_dna)
-        self.dnas = new_dnas
+        n = len(self.start_positions)
+        rows = np.array([rocket.index for rocket in rockets])
+        fitness = self.state.fitness[rows]
+
+        # Pick the best elite_k rows in O(N) without sorting everything
+        elite_k = max(0, min(elite_k, len(rows), n))
+        elite = rows[np.argpartition(-fitness, elite_k - 1)[:elite_k]] if elite_k else rows[:0]
+
+        # Normalize once per generation and reuse it for every selection
+        cdf = self._build_cdf(self._get_normalized_fitnesses(fitness))
+        k = n - elite_k
+        # SUS returns parents in CDF order; shuffle before pairing them up
+        parents = rows[self.rng.permutation(self.sus_select(cdf, 2 * k))]
+
+        new_dna = np.empty_like(self.state.dna[:n])
+        new_dna[:elite_k] = self.state.dna[elite]
+        new_dna[elite_k:] = self.reproduce(parents[:k], parents[k:])
+        self.dna = new_dna
 
     def update_mutation_rate(self, new_rate):
         """
@@ -105,4 +370,10 @@ class Population:
         self.mutation_rate = max(0.0, min(1.0, new_rate))
 
     def get_dnas(self):
-        return [dna.to_list() for dna in self.dnas] 
\ No newline at end of file
+        """
+        Get the DNA of the next generation to spawn.
+
+        Returns:
+            np.ndarray: Thrust vectors of shape (N, L, 2), float32
+        """
+        return self.dna 
\ No newline at end of file
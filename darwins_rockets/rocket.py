@@ -1,9 +1,13 @@
 import math
 import random
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
+from darwins_rockets.state import PopulationState
+
+# Generator for standalone rockets drawing their own random DNA
+_RNG = np.random.default_rng()
 
 class Entity(ABC):
     @abstractmethod
@@ -35,7 +39,7 @@ class Vector2D:
     def random_unit_vector() -> np.ndarray:
         """Generate a random unit vector (magnitude = 1)."""
         angle = random.uniform(0, 2 * math.pi)
-        return np.array([math.cos(angle), math.sin(angle)], dtype=float)
+        return np.array([math.cos(angle), math.sin(angle)], dtype=np.float32)
     
     @staticmethod
     def random_thrust_vector(min_magnitude: float, max_magnitude: float) -> np.ndarray:
@@ -47,15 +51,29 @@ class Vector2D:
     @staticmethod
     def limit_magnitude(vector: np.ndarray, max_magnitude: float) -> np.ndarray:
         """Limit a vector's magnitude to the specified maximum."""
-        magnitude = np.linalg.norm(vector)
-        if magnitude > max_magnitude:
-            return vector / magnitude * max_magnitude
+        # Plain scalar math; np.linalg.norm dispatch dwarfs the work on 2-vectors
+        x = float(vector[0])
+        y = float(vector[1])
+        magnitude_sq = x * x + y * y
+        if magnitude_sq > max_magnitude * max_magnitude:
+            return vector * (max_magnitude / math.sqrt(magnitude_sq))
         return vector
     
+    @staticmethod
+    def limit_magnitude_inplace(vector: np.ndarray, max_magnitude: float) -> None:
+        """Limit a vector's magnitude to the specified maximum without allocating."""
+        x = float(vector[0])
+        y = float(vector[1])
+        magnitude_sq = x * x + y * y
+        if magnitude_sq > max_magnitude * max_magnitude:
+            vector *= max_magnitude / math.sqrt(magnitude_sq)
+    
     @staticmethod
     def safe_distance(pos1: np.ndarray, pos2: np.ndarray) -> float:
         """Calculate distance between two positions, handling edge cases."""
-        return np.linalg.norm(pos1 - pos2)
+        dx = float(pos1[0]) - float(pos2[0])
+        dy = float(pos1[1]) - float(pos2[1])
+        return math.sqrt(dx * dx + dy * dy)
 
 
 class Rocket(Entity):
@@ -68,7 +86,9 @@ class Rocket(Entity):
     
     def __init__(self, start_pos: Tuple[float, float], 
                  dna_length: int = RocketConfig.DEFAULT_DNA_LENGTH,
-                 config: RocketConfig = None):
+                 config: RocketConfig = None,
+                 state: PopulationState = None,
+                 index: int = 0):
         """
         Initialize a new rocket.
         
@@ -76,42 +96,116 @@ class Rocket(Entity):
             start_pos: Starting position as (x, y) tuple
             dna_length: Number of thrust instructions in DNA sequence
             config: Configuration object (uses default if None)
+            state: Shared population state to view (allocates its own if None)
+            index: Row of this rocket inside the shared state
         """
         # Initialize configuration
         self.config = config or RocketConfig()
         
-        # Initialize physics properties using numpy for efficiency
-        self.pos = np.array(start_pos, dtype=float)
-        self.vel = np.zeros(2, dtype=float)
-        self.acc = np.zeros(2, dtype=float)
-        
-        # Initialize genetic algorithm properties
-        self.dna_length = dna_length
-        self.dna = self._generate_random_dna()
-        self.current_step = 0
-        
-        # Initialize evaluation properties
-        self.fitness = 0.0
-        self.has_reached_target = False
-        self.target_reached_step = None
+        # Physics and genetic properties live in a struct-of-arrays state;
+        # a standalone rocket owns a single-row state of its own
+        self._owns_state = state is None
+        if self._owns_state:
+            self.dna_length = dna_length
+            state = PopulationState.allocate(
+                [start_pos],
+                self._generate_random_dna()[None],
+                self.config.MAX_TRAIL_LENGTH
+            )
+            index = 0
+        self._state = state
+        self.index = index
+        self.dna_length = state.dna_length
         
         # Initialize visual properties
         self.radius = self.config.RADIUS
-        self.trail: List[np.ndarray] = []
         
         # Initialize state flags
-        self.is_active = True
         self.has_collided = False
     
-    def _generate_random_dna(self) -> List[np.ndarray]:
-        """Generate a random DNA sequence of thrust vectors."""
-        return [
-            Vector2D.random_thrust_vector(
-                self.config.MIN_THRUST_MAGNITUDE,
-                self.config.MAX_THRUST_MAGNITUDE
-            )
-            for _ in range(self.dna_length)
-        ]
+    @property
+    def pos(self) -> np.ndarray:
+        """Current position (a view into the population state)."""
+        return self._state.pos[self.index]
+    
+    @pos.setter
+    def pos(self, value) -> None:
+        self._state.pos[self.index] = value
+    
+    @property
+    def vel(self) -> np.ndarray:
+        """Current velocity (a view into the population state)."""
+        return self._state.vel[self.index]
+    
+    @vel.setter
+    def vel(self, value) -> None:
+        self._state.vel[self.index] = value
+    
+    @property
+    def acc(self) -> np.ndarray:
+        """Thrust of the last DNA instruction, derived from the DNA on demand."""
+        return self._state.get_acc(self.index)
+    
+    @property
+    def dna(self) -> np.ndarray:
+        """DNA thrust vectors of shape (dna_length, 2)."""
+        return self._state.dna[self.index]
+    
+    @dna.setter
+    def dna(self, value) -> None:
+        self._state.dna[self.index] = np.asarray(value, dtype=np.float32)
+    
+    @property
+    def current_step(self) -> int:
+        return int(self._state.current_step[self.index])
+    
+    @current_step.setter
+    def current_step(self, value: int) -> None:
+        self._state.current_step[self.index] = value
+    
+    @property
+    def fitness(self) -> float:
+        return float(self._state.fitness[self.index])
+    
+    @fitness.setter
+    def fitness(self, value: float) -> None:
+        self._state.fitness[self.index] = value
+    
+    @property
+    def is_active(self) -> bool:
+        return bool(self._state.active[self.index])
+    
+    @is_active.setter
+    def is_active(self, value: bool) -> None:
+        self._state.active[self.index] = value
+    
+    @property
+    def has_reached_target(self) -> bool:
+        return bool(self._state.has_reached_target[self.index])
+    
+    @property
+    def target_reached_step(self) -> Optional[int]:
+        """Step at which the target was first reached, or None."""
+        step = int(self._state.target_reached_step[self.index])
+        return step if step >= 0 else None
+    
+    @property
+    def trail(self) -> np.ndarray:
+        """Recent positions, oldest first."""
+        return self._state.get_trail(self.index)
+    
+    def _generate_random_dna(self) -> np.ndarray:
+        """Generate a random DNA sequence of thrust vectors, shape (dna_length, 2)."""
+        # Draw the whole sequence at once rather than one gene at a time
+        angles = _RNG.uniform(0, 2 * math.pi, self.dna_length)
+        magnitudes = _RNG.uniform(
+            self.config.MIN_THRUST_MAGNITUDE,
+            self.config.MAX_THRUST_MAGNITUDE,
+            self.dna_length
+        )
+        return np.stack(
+            [magnitudes * np.cos(angles), magnitudes * np.sin(angles)], -1
+        ).astype(np.float32)
     
     def update(self, world) -> None:
         """
@@ -123,48 +217,57 @@ class Rocket(Entity):
         if not self.is_active:
             return
         
-        # Apply current DNA instruction or stop if out of fuel
-        self._apply_thrust()
-        
-        # Update physics
-        self._update_physics()
-        
-        # Update visual trail
-        self._update_trail()
+        # Rockets viewing a shared state are stepped in bulk by
+        # Population.step_all; only standalone rockets step themselves
+        if self._owns_state:
+            # Apply current DNA instruction or stop if out of fuel
+            thrust = self._apply_thrust()
+            
+            # Update physics
+            self._update_physics(thrust)
+            
+            # Update visual trail
+            self._update_trail()
         
         # Check for collisions or boundaries
         self._check_world_interactions(world)
     
-    def _apply_thrust(self) -> None:
-        """Apply thrust based on current DNA instruction."""
-        if self.current_step < self.dna_length:
-            self.acc = self.dna[self.current_step].copy()
-            self.current_step += 1
-        else:
-            # Out of fuel - no more thrust
-            self.acc = np.zeros(2, dtype=float)
-    
-    def _update_physics(self) -> None:
-        """Update velocity and position based on current acceleration."""
+    def _apply_thrust(self) -> Optional[np.ndarray]:
+        """
+        Consume the current DNA instruction.
+        
+        Returns:
+            View of the thrust vector in the DNA, or None when out of fuel
+        """
+        step = self.current_step
+        if step < self.dna_length:
+            self.current_step = step + 1
+            return self.dna[step]
+        # Out of fuel - no more thrust
+        return None
+    
+    def _update_physics(self, thrust: Optional[np.ndarray]) -> None:
+        """Update velocity and position based on the applied thrust."""
+        config = self.config
+        vel = self.vel
+        
         # Apply acceleration to velocity
-        self.vel += self.acc
+        if thrust is not None:
+            vel += thrust
         
         # Apply velocity damping (simulates air resistance)
-        self.vel *= self.config.VELOCITY_DAMPING
+        vel *= config.VELOCITY_DAMPING
         
         # Limit maximum velocity to prevent unrealistic speeds
-        self.vel = Vector2D.limit_magnitude(self.vel, self.config.MAX_VELOCITY)
+        Vector2D.limit_magnitude_inplace(vel, config.MAX_VELOCITY)
         
         # Update position
-        self.pos += self.vel
+        pos = self.pos
+        pos += vel
     
     def _update_trail(self) -> None:
         """Update the visual trail with current position."""
-        self.trail.append(self.pos.copy())
-        
-        # Limit trail length to prevent memory issues
-        if len(self.trail) > self.config.MAX_TRAIL_LENGTH:
-            self.trail.pop(0)
+        self._state.push_trail([self.index])
     
     def _check_world_interactions(self, world) -> None:
         """Check for collisions with world boundaries or obstacles."""
@@ -179,50 +282,13 @@ class Rocket(Entity):
         Args:
             target_pos: Target position as (x, y) tuple
         """
-        target_array = np.array(target_pos, dtype=float)
-        distance_to_target = Vector2D.safe_distance(self.pos, target_array)
-        
-        # Check if rocket has reached the target
-        if distance_to_target <= self.config.TARGET_RADIUS and not self.has_reached_target:
-            self._handle_target_reached()
-        
-        # Calculate fitness based on performance
-        if self.has_reached_target:
-            self.fitness = self._calculate_success_fitness()
-        else:
-            self.fitness = self._calculate_distance_fitness(distance_to_target)
-    
-    def _handle_target_reached(self) -> None:
-        """Handle the event when rocket reaches the target."""
-        self.has_reached_target = True
-        self.target_reached_step = self.current_step
-        # Rocket continues moving but we remember when it reached target
-    
-    def _calculate_success_fitness(self) -> float:
-        """Calculate fitness for rockets that reached the target."""
-        # Base reward for reaching target
-        base_reward = self.config.FITNESS_TARGET_REWARD
-        
-        # Bonus for reaching target quickly (more efficient path)
-        if self.target_reached_step is not None:
-            steps_remaining = self.dna_length - self.target_reached_step
-            efficiency_bonus = steps_remaining * self.config.FITNESS_BONUS_PER_STEP
-            return base_reward + efficiency_bonus
-        
-        return base_reward
-    
-    def _calculate_distance_fitness(self, distance: float) -> float:
-        """
-        Calculate fitness based on distance to target.
-        
-        Args:
-            distance: Distance to target
-            
-        Returns:
-            Fitness score (higher is better)
-        """
-        # Use inverse distance with small epsilon to avoid division by zero
-        return 1.0 / (distance + np.finfo(float).eps)
+        self._state.evaluate_fitness(
+            target_pos,
+            self.config.TARGET_RADIUS,
+            self.config.FITNESS_TARGET_REWARD,
+            self.config.FITNESS_BONUS_PER_STEP,
+            rows=slice(self.index, self.index + 1)
+        )
     
     def get_state(self) -> Dict[str, Any]:
         """
@@ -236,7 +302,7 @@ class Rocket(Entity):
             'vel': self.vel.tolist(),
             'acc': self.acc.tolist(),
             'fitness': self.fitness,
-            'trail': [position.tolist() for position in self.trail],
+            'trail': self.trail.tolist(),
             'radius': self.radius,
             'is_active': self.is_active,
             'has_reached_target': self.has_reached_target,
@@ -255,13 +321,9 @@ class Rocket(Entity):
         Returns:
             New rocket instance with the provided DNA
         """
-        clone = Rocket(self.pos.copy(), len(new_dna), self.config)
-        clone.dna = [instruction.copy() for instruction in new_dna]
+        clone = Rocket(self.pos, len(new_dna), self.config)
+        clone.dna = new_dna
         return clone
-    
-    def get_dna_copy(self) -> List[np.ndarray]:
-        """Get a deep copy of the rocket's DNA for genetic operations."""
-        return [instruction.copy() for instruction in self.dna]
 
 class Target(Entity):
     def __init__(self, pos, radius=20):
@@ -1,7 +1,6 @@
 import pygame
 import sys
-import math
-from darwins_rockets.rocket import Target
+from darwins_rockets.rocket import RocketConfig, Target
 from darwins_rockets.world import World
 import numpy as np
 from config import (
@@ -40,6 +39,7 @@ class Simulation:
     INFO_PANEL_WIDTH = 340
     PANEL_HEIGHT = 220
     PANEL_GAP = 12
+    ROCKET_SPRITE_BUCKETS = 16
 
     def __init__(self):
         pygame.init()
@@ -91,12 +91,31 @@ class Simulation:
         self.current_fps = self.FPS  # Current FPS for speed control
         self.speed_multiplier = 1.0  # Speed multiplier (1.0 = normal speed)
         self.speed_step = 0.5  # Amount to change speed per key press
+        
+        # Rendered fitness labels keyed by (fitness bucket, high fitness)
+        self._fitness_labels = {}
+        
+        # Rocket sprites for each color bucket, pre-rendered once
+        self._rocket_sprites = []
+        self._rocket_idle_sprites = []
+        self._build_rocket_sprites()
+        
+        # Static background, pre-rendered once and rebuilt on resize
+        self._bg_surface = None
+        self._gradient_surface = None
+        self._static_surface = None
+        # Screen regions drawn this frame and last frame, for dirty-rect updates
+        self._dirty_rects = []
+        self._prev_rects = []
+        self._full_redraw = True
+        self._rebuild_static_bg()
 
     def is_mouse_over_target(self, mouse_pos):
         """Check if mouse position is over the target"""
-        target_center = pygame.Vector2(self.world.target_pos)
-        mouse_pos_vec = pygame.Vector2(mouse_pos)
-        return mouse_pos_vec.distance_to(target_center) <= self.TARGET_RADIUS
+        tx, ty = self.world.target_pos
+        dx = mouse_pos[0] - tx
+        dy = mouse_pos[1] - ty
+        return dx * dx + dy * dy <= self.TARGET_RADIUS * self.TARGET_RADIUS
 
     def update_target_position(self, mouse_pos):
         """Update target position to mouse position, keeping it within bounds"""
@@ -115,68 +134,64 @@ class Simulation:
         pygame.draw.rect(self.WIN, (255, 255, 255, 50), bg_rect, 2, border_radius=10)
         
         self.WIN.blit(msg, rect)
+        return bg_rect
 
-    def draw_fitness(self, rocket, normalized_fitness):
-        # Display normalized fitness (0.00 to 1.00) with better styling
-        fitness_text = f"{normalized_fitness:.4f}"
+    def _render_fitness(self, bucket, high):
+        """Render a fitness label on its background once per (bucket, size) pair"""
+        label = self._fitness_labels.get((bucket, high))
+        if label is not None:
+            return label
         
-        # Choose font size based on fitness value
-        if normalized_fitness > 0.8:
-            font = self.font
-            text_color = (255, 255, 255)  # White for high fitness
-        else:
-            font = self.font_small
-            text_color = (200, 200, 200)  # Light gray for lower fitness
+        # Larger white text for high fitness, smaller light gray otherwise
+        font = self.font if high else self.font_small
+        text_color = (255, 255, 255) if high else (200, 200, 200)
+        msg = font.render(f"{bucket / 100:.2f}", True, text_color)
         
-        msg = font.render(fitness_text, True, text_color)
+        # Draw background for better readability
+        label = pygame.Surface(msg.get_rect().inflate(8, 4).size).convert()
+        label.fill((0, 0, 0))
+        label.blit(msg, (4, 2))
+        self._fitness_labels[(bucket, high)] = label
+        return label
+
+    def draw_fitness(self, rocket, normalized_fitness):
+        # Display normalized fitness (0.00 to 1.00), quantized so labels can be cached
+        label = self._render_fitness(int(normalized_fitness * 100), normalized_fitness > 0.8)
         
         # Position above rocket with slight offset
         pos = (int(rocket.pos[0]), int(rocket.pos[1]) - rocket.radius - 25)
-        rect = msg.get_rect(center=pos)
-        
-        # Draw background for better readability
-        bg_rect = rect.inflate(8, 4)
-        pygame.draw.rect(self.WIN, (0, 0, 0, 100), bg_rect, border_radius=4)
-        
-        self.WIN.blit(msg, rect)
+        return self.WIN.blit(label, label.get_rect(center=pos))
 
     def restart(self):
         self.world = World(self.WIDTH, self.HEIGHT, population_size=self.NUM_ROCKETS, dna_length=self.DNA_LENGTH, mutation_rate=0.03)
         self.world.set_target(self.WIDTH // 2, self.HEIGHT // 4, radius=self.TARGET_RADIUS)
         self.paused = False
 
-    def get_normalized_fitness(self, rocket, min_fitness, max_fitness):
+    def get_normalized_fitnesses(self, min_fitness, max_fitness):
+        fitness = self.world.fitness
         if max_fitness > min_fitness:
-            return (rocket.fitness - min_fitness) / (max_fitness - min_fitness)
-        return 0.0
+            return (fitness - min_fitness) / (max_fitness - min_fitness)
+        return np.zeros_like(fitness)
 
-    def get_rocket_color(self, rocket, min_fitness, max_fitness):
-        # If rocket reached the target, color is green
-        dist = math.hypot(rocket.pos[0] - self.world.target_pos[0], rocket.pos[1] - self.world.target_pos[1])
-        if dist <= self.TARGET_RADIUS:
-            return (0, 255, 0)
-        # Use normalized fitness for color mapping
-        norm = self.get_normalized_fitness(rocket, min_fitness, max_fitness)
-        # Interpolate from red to green
-        r = int(255 * (1 - norm))
-        g = int(255 * norm)
-        # Clamp values to 0-255
-        r = max(0, min(255, r))
-        g = max(0, min(255, g))
-        return (r, g, 0)
+    def get_rocket_colors(self, normalized_fitnesses):
+        # Interpolate every rocket from red to green by normalized fitness
+        norm = np.clip(normalized_fitnesses, 0.0, 1.0)
+        colors = np.zeros((norm.size, 3), dtype=np.uint8)
+        colors[:, 0] = 255 * (1 - norm)
+        colors[:, 1] = 255 * norm
+        # Rockets currently inside the target are green
+        colors[self.world.rockets_within(self.world.target_pos, self.TARGET_RADIUS)] = (0, 255, 0)
+        return colors
 
     def draw_simulation_area(self, surface, rect):
-        # Draw a subtle gradient background
-        bg_color_top = (210, 215, 230)
-        bg_color_bottom = (180, 185, 210)
-        for y in range(rect.height):
-            blend = y / rect.height
-            color = (
-                int(bg_color_top[0] * (1 - blend) + bg_color_bottom[0] * blend),
-                int(bg_color_top[1] * (1 - blend) + bg_color_bottom[1] * blend),
-                int(bg_color_top[2] * (1 - blend) + bg_color_bottom[2] * blend),
-            )
-            pygame.draw.line(surface, color, (rect.x, rect.y + y), (rect.x + rect.width, rect.y + y))
+        if self._full_redraw:
+            # Draw the pre-rendered static background over the whole area
+            surface.blit(self._static_surface, rect.topleft)
+        else:
+            # Only restore the background under what was drawn last frame
+            for dirty in self._prev_rects:
+                surface.blit(self._static_surface, dirty, dirty)
+        self._dirty_rects = []
         # Draw simulation content
         prev_clip = surface.get_clip()
         self.draw_simulation_content()
@@ -271,6 +286,7 @@ class Simulation:
         self.WIN.blit(rate_surface, rate_rect)
         self.WIN.blit(gen_surface, gen_rect)
         self.WIN.blit(speed_surface, speed_rect)
+        return rate_bg_rect.unionall([gen_bg_rect, speed_bg_rect])
 
     def quit_sim(self):
         pygame.quit()
@@ -278,84 +294,133 @@ class Simulation:
 
     def draw_simulation_content(self):
         """Draw the main simulation content"""
-        # Draw background elements
-        self.draw_background_grid()
-        self.draw_simulation_boundaries()
-        self.draw_start_positions()
+        dirty = self._dirty_rects
         # Draw title for the main simulation area
-        self.draw_simulation_title()
-        # Draw all entities in the world
-        for entity in self.world.get_entities():
+        dirty.append(self.draw_simulation_title())
+        # Draw the non-rocket entities (targets) below the rockets
+        for entity in self.world.non_rocket_entities:
             if isinstance(entity, Target):
                 target_color = self.TARGET_HOVER if self.target_hovered else self.TARGET_COLOR
                 target_radius = self.TARGET_RADIUS + 3 if self.target_hovered else self.TARGET_RADIUS
                 # Draw target glow effect
                 if self.target_hovered:
-                    pygame.draw.circle(self.WIN, (255, 255, 255, 50), entity.pos, target_radius + 8)
+                    dirty.append(pygame.draw.circle(self.WIN, (255, 255, 255, 50), entity.pos, target_radius + 8))
                 # Draw target
-                pygame.draw.circle(self.WIN, target_color, entity.pos, target_radius)
+                dirty.append(pygame.draw.circle(self.WIN, target_color, entity.pos, target_radius))
                 pygame.draw.circle(self.WIN, (255, 255, 255), entity.pos, target_radius - 5, 2)
                 # Draw target center
                 pygame.draw.circle(self.WIN, (255, 255, 255), entity.pos, 3)
-            elif hasattr(entity, 'fitness'):
-                stats = self.world.get_stats()
-                min_fitness = 0
-                max_fitness = stats.get('best_fitness_current_gen', 1)
-                normalized_fitness = (entity.fitness - min_fitness) / (max_fitness - min_fitness) if max_fitness > min_fitness else 0.0
-                color = self.get_rocket_color(entity, min_fitness, max_fitness)
-                trail = getattr(entity, 'trail', [])
-                if len(trail) > 1:
-                    for i in range(len(trail) - 1):
-                        alpha = int(255 * (i / len(trail)))
-                        trail_color = (*color[:3], alpha)
-                        start = trail[i]
-                        end = trail[i + 1]
-                        pygame.draw.line(self.WIN, trail_color, start, end, 2)
-                pos = entity.pos
-                pygame.draw.circle(self.WIN, color, (int(pos[0]), int(pos[1])), entity.radius)
-                vel = getattr(entity, 'vel', np.zeros(2))
-                if np.linalg.norm(vel) > 0.1:
-                    direction = vel / np.linalg.norm(vel)
-                    end_pos = (pos[0] + direction[0] * (entity.radius + 5), pos[1] + direction[1] * (entity.radius + 5))
-                    pygame.draw.line(self.WIN, (255, 255, 255), pos, end_pos, 2)
-                    arrow_size = 4
-                    perp = (-direction[1], direction[0])
-                    arrow1 = (end_pos[0] - direction[0] * arrow_size + perp[0] * arrow_size,
-                              end_pos[1] - direction[1] * arrow_size + perp[1] * arrow_size)
-                    arrow2 = (end_pos[0] - direction[0] * arrow_size - perp[0] * arrow_size,
-                              end_pos[1] - direction[1] * arrow_size - perp[1] * arrow_size)
-                    pygame.draw.polygon(self.WIN, (255, 255, 255), [end_pos, arrow1, arrow2])
-                pygame.draw.circle(self.WIN, (255, 255, 255), (int(pos[0]), int(pos[1])), 2)
-                self.draw_fitness(entity, normalized_fitness)
+        # Draw all rockets
+        stats = self.world.get_stats()
+        min_fitness = 0
+        max_fitness = stats.get('best_fitness_current_gen', 1)
+        normalized_fitnesses = self.get_normalized_fitnesses(min_fitness, max_fitness)
+        colors_arr = self.get_rocket_colors(normalized_fitnesses)
+        # Pick a pre-rendered sprite per rocket by its green channel and
+        # rotate it to face along the velocity
+        buckets = ((colors_arr[:, 1].astype(np.int32) * (self.ROCKET_SPRITE_BUCKETS - 1) + 127) // 255).tolist()
+        vel = self.world.vel
+        moving = (np.einsum('ij,ij->i', vel, vel) > 0.01).tolist()
+        angles = np.degrees(np.arctan2(-vel[:, 1], vel[:, 0])).tolist()
+        colors = colors_arr.tolist()
+        for rocket in self.world.get_rockets():
+            i = rocket.index
+            # pygame only accepts plain Python numbers as coordinates,
+            # so float32 state is converted at this boundary
+            trail = rocket.trail.tolist()
+            if len(trail) > 1:
+                # One polyline per rocket instead of a draw call per segment
+                dirty.append(pygame.draw.lines(self.WIN, colors[i], False, trail, 2))
+            if moving[i]:
+                sprite = pygame.transform.rotozoom(self._rocket_sprites[buckets[i]], angles[i], 1.0)
+            else:
+                sprite = self._rocket_idle_sprites[buckets[i]]
+            pos = rocket.pos
+            dirty.append(self.WIN.blit(sprite, sprite.get_rect(center=(int(pos[0]), int(pos[1])))))
+            dirty.append(self.draw_fitness(rocket, normalized_fitnesses[i]))
         # If simulation is not running, show message
         if not (self.running and not self.paused):
-            self.draw_message("All rockets out of bounds! Press R to restart or Q to quit.")
+            dirty.append(self.draw_message("All rockets out of bounds! Press R to restart or Q to quit."))
 
-    def draw_background_grid(self):
+    def present_frame(self):
+        """Push the frame to the screen, limited to the dirty regions when possible"""
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        else:
+            # Regions drawn last frame must be updated too so they get cleared
+            pygame.display.update(self._prev_rects + self._dirty_rects)
+        self._prev_rects = self._dirty_rects
+
+    def _make_rocket_sprite(self, color, with_arrow):
+        """Render a rocket body, pointing along +x when drawn with its direction arrow"""
+        radius = int(RocketConfig.RADIUS)
+        arrow_size = 4
+        half = radius + 5 + arrow_size
+        sprite = pygame.Surface((2 * half + 1, 2 * half + 1), pygame.SRCALPHA).convert_alpha()
+        center = (half, half)
+        pygame.draw.circle(sprite, color, center, radius)
+        if with_arrow:
+            end_pos = (half + radius + 5, half)
+            pygame.draw.line(sprite, (255, 255, 255), center, end_pos, 2)
+            arrow1 = (end_pos[0] - arrow_size, half + arrow_size)
+            arrow2 = (end_pos[0] - arrow_size, half - arrow_size)
+            pygame.draw.polygon(sprite, (255, 255, 255), [end_pos, arrow1, arrow2])
+        pygame.draw.circle(sprite, (255, 255, 255), center, 2)
+        return sprite
+
+    def _build_rocket_sprites(self):
+        """Pre-render rocket sprites for each bucket of the red to green color ramp"""
+        ramp = np.linspace(0.0, 1.0, self.ROCKET_SPRITE_BUCKETS)
+        colors = [(int(255 * (1 - norm)), int(255 * norm), 0) for norm in ramp]
+        self._rocket_sprites = [self._make_rocket_sprite(color, True) for color in colors]
+        self._rocket_idle_sprites = [self._make_rocket_sprite(color, False) for color in colors]
+
+    def _rebuild_static_bg(self):
+        """Pre-render the gradient, grid, boundaries and start markers, which only change on resize"""
+        # Build one column of the subtle vertical gradient and stretch it across the window
+        width, height = self.WIN.get_size()
+        bg_color_top = (210, 215, 230)
+        bg_color_bottom = (180, 185, 210)
+        column = np.linspace(bg_color_top, bg_color_bottom, height, endpoint=False).astype(np.uint8)
+        gradient = pygame.surfarray.make_surface(column[np.newaxis])
+        self._gradient_surface = pygame.transform.scale(gradient, (width, height)).convert()
+        
+        self._bg_surface = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA).convert_alpha()
+        self.draw_background_grid(self._bg_surface)
+        self.draw_simulation_boundaries(self._bg_surface)
+        self.draw_start_positions(self._bg_surface)
+        
+        # Flatten everything static into one opaque surface to restore dirty regions from
+        self._static_surface = self._gradient_surface.copy()
+        self._static_surface.blit(self._bg_surface, (0, 0))
+        self._full_redraw = True
+
+    def draw_background_grid(self, surface):
         """Draw a subtle grid pattern in the background (main area only)"""
         grid_color = (230, 230, 235)  # Very light blue-gray
         grid_spacing = 50
         
         # Vertical lines (only in main area)
         for x in range(0, self.WIDTH, grid_spacing):
-            pygame.draw.line(self.WIN, grid_color, (x, 0), (x, self.HEIGHT), 1)
+            pygame.draw.line(surface, grid_color, (x, 0), (x, self.HEIGHT), 1)
         
         # Horizontal lines (only in main area)
         for y in range(0, self.HEIGHT, grid_spacing):
-            pygame.draw.line(self.WIN, grid_color, (0, y), (self.WIDTH, y), 1)
+            pygame.draw.line(surface, grid_color, (0, y), (self.WIDTH, y), 1)
     
-    def draw_simulation_boundaries(self):
+    def draw_simulation_boundaries(self, surface):
         """Draw boundary lines around the main simulation area"""
         boundary_color = (200, 200, 210)  # Light gray-blue
-        pygame.draw.rect(self.WIN, boundary_color, (0, 0, self.WIDTH, self.HEIGHT), 2)
+        pygame.draw.rect(surface, boundary_color, (0, 0, self.WIDTH, self.HEIGHT), 2)
     
-    def draw_start_positions(self):
+    def draw_start_positions(self, surface):
         """Draw markers for rocket start positions"""
         for pos in self.ROCKET_START_POSITIONS:
             # Draw a small circle at each start position
-            pygame.draw.circle(self.WIN, (180, 180, 200), pos, 3)
+            pygame.draw.circle(surface, (180, 180, 200), pos, 3)
             # Draw a subtle line to show the starting area
-            pygame.draw.line(self.WIN, (180, 180, 200), (pos[0], pos[1] + 10), (pos[0], pos[1] + 30), 1)
+            pygame.draw.line(surface, (180, 180, 200), (pos[0], pos[1] + 10), (pos[0], pos[1] + 30), 1)
     
     def draw_simulation_title(self):
         """Draw title for the main simulation area"""
@@ -368,6 +433,7 @@ class Simulation:
         pygame.draw.rect(self.WIN, (200, 200, 210), bg_rect, 2, border_radius=8)
         
         self.WIN.blit(title, title_rect)
+        return bg_rect
 
     def handle_window_resize(self, new_width, new_height):
         """Handle window resize events"""
@@ -384,6 +450,9 @@ class Simulation:
         
         # Update layout based on new size
         self.update_layout_for_size(new_width, new_height)
+        
+        # Re-render the static background for the new size
+        self._rebuild_static_bg()
 
     def update_layout_for_size(self, width, height):
         """Update layout parameters based on window size"""
@@ -396,6 +465,9 @@ class Simulation:
         # Update height
         self.HEIGHT = height
         
+        # Resize the world in place, keeping the population evolving
+        self.world.resize(self.WIDTH, self.HEIGHT)
+        
         # Update target position to be proportional
         self.world.set_target(self.WIDTH // 2, self.HEIGHT // 4, radius=self.TARGET_RADIUS)
         
@@ -405,24 +477,6 @@ class Simulation:
             for i in range(self.NUM_ROCKETS)
         ] 
 
-        # Update population with new positions
-        if hasattr(self, 'world'):
-            self.world = World(self.WIDTH, self.HEIGHT, population_size=self.NUM_ROCKETS, dna_length=self.DNA_LENGTH, mutation_rate=0.03)
-            self.world.set_target(self.WIDTH // 2, self.HEIGHT // 4, radius=self.TARGET_RADIUS)
-        
-        # Update rocket bounds checking
-        self.update_rocket_bounds()
-
-    def update_rocket_bounds(self):
-        """Update rocket bounds checking with current window dimensions"""
-        rockets = self.world.get_rockets()
-        for rocket in rockets:
-            # Update fitness with current bounds
-            rocket.evaluate_fitness(self.world.target_pos)
-            # Check if rocket is out of bounds with current window size
-            if rocket.pos[0] > self.WIDTH or rocket.pos[1] > self.HEIGHT:
-                rocket.fitness *= 0.1  # 90% penalty for out of bounds 
-
     def run(self):
         while True:
             dt = self.clock.tick(self.current_fps) / 1000.0
@@ -440,6 +494,10 @@ class Simulation:
                     sys.exit()
                 if event.type == pygame.VIDEORESIZE:
                     self.handle_window_resize(event.w, event.h)
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                                  pygame.WINDOWSHOWN, pygame.WINDOWRESTORED):
+                    # The window contents were invalidated; repaint all of it
+                    self._full_redraw = True
                 if event.type == pygame.MOUSEBUTTONDOWN:
                      if event.button == 1:
                         if self.is_mouse_over_target(event.pos):
@@ -480,7 +538,6 @@ class Simulation:
             win_width, win_height = self.WIN.get_size()
             sim_rect = pygame.Rect(0,0, win_width, win_height)
             # --- Drawing ---
-            self.WIN.fill((200, 205, 220))
             self.draw_simulation_area(self.WIN, sim_rect)
-            self.draw_mutation_rate()  # Draw mutation rate if needed
-            pygame.display.flip() 
\ No newline at end of file
+            self._dirty_rects.append(self.draw_mutation_rate())  # Draw mutation rate if needed
+            self.present_frame() 
\ No newline at end of file
@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+import numpy as np
+
+# Guards the inverse-distance fitness against division by zero
+_EPS = np.finfo(np.float32).eps
+
+
+@dataclass
+class PopulationState:
+    """
+    Struct-of-arrays storage for a whole population of rockets.
+
+    Row ``i`` of every array describes rocket ``i``. Rockets handed out to the
+    rest of the simulation are thin views over a single row, so one vectorized
+    operation on these arrays advances every rocket at once.
+    """
+    dna: np.ndarray           # (N, L, 2) float32 thrust vectors
+    pos: np.ndarray           # (N, 2) float32 positions
+    vel: np.ndarray           # (N, 2) float32 velocities
+    current_step: np.ndarray  # (N,) int32 index of the next DNA instruction
+    active: np.ndarray        # (N,) bool, inactive rockets are not stepped
+    fitness: np.ndarray       # (N,) float32 fitness scores
+    distance_sq: np.ndarray          # (N,) float32 squared distance to the target at last evaluation
+    has_reached_target: np.ndarray   # (N,) bool
+    target_reached_step: np.ndarray  # (N,) int32 step the target was reached, -1 if not
+    trail: np.ndarray         # (N, T, 2) float32 ring buffer of recent positions
+    trail_head: np.ndarray    # (N,) int32 slot the next trail position is written to
+    trail_count: np.ndarray   # (N,) int32 number of valid trail entries
+
+    @classmethod
+    def allocate(cls, start_positions: Sequence[Tuple[float, float]],
+                 dna: np.ndarray, trail_length: int) -> 'PopulationState':
+        """
+        Allocate the arrays for a freshly spawned population.
+
+        Args:
+            start_positions: Starting (x, y) position of each rocket
+            dna: Thrust vectors of shape (N, L, 2)
+            trail_length: Number of positions kept in each rocket's trail
+
+        Returns:
+            New state with every rocket at rest on its start position
+        """
+        dna = np.asarray(dna, dtype=np.float32)
+        n = dna.shape[0]
+        return cls(
+            dna=dna,
+            pos=np.array(start_positions, dtype=np.float32).reshape(n, 2),
+            vel=np.zeros((n, 2), dtype=np.float32),
+            current_step=np.zeros(n, dtype=np.int32),
+            active=np.ones(n, dtype=bool),
+            fitness=np.zeros(n, dtype=np.float32),
+            distance_sq=np.full(n, np.inf, dtype=np.float32),
+            has_reached_target=np.zeros(n, dtype=bool),
+            target_reached_step=np.full(n, -1, dtype=np.int32),
+            trail=np.zeros((n, trail_length, 2), dtype=np.float32),
+            trail_head=np.zeros(n, dtype=np.int32),
+            trail_count=np.zeros(n, dtype=np.int32),
+        )
+
+    @property
+    def size(self) -> int:
+        """Number of rockets stored in the state."""
+        return self.dna.shape[0]
+
+    @property
+    def dna_length(self) -> int:
+        """Number of thrust instructions per rocket."""
+        return self.dna.shape[1]
+
+    def get_acc(self, index: int) -> np.ndarray:
+        """
+        Derive the thrust of one rocket's most recent DNA instruction.
+
+        Thrust is never stored; it is read back from the DNA on demand and
+        reported as zero once the rocket has used up its DNA.
+        """
+        step = self.current_step[index]
+        if 0 < step < self.dna_length:
+            return self.dna[index, step - 1]
+        return np.zeros(2, dtype=np.float32)
+
+    def evaluate_fitness(self, target_pos: Tuple[float, float], target_radius: float,
+                         target_reward: float, bonus_per_step: float,
+                         rows=slice(None)) -> None:
+        """
+        Calculate and update the fitness of the selected rockets in one pass.
+
+        Rockets within ``target_radius`` are marked as having reached the
+        target and score ``target_reward`` plus a bonus per unused DNA step;
+        the rest score the inverse of their distance to the target.
+
+        Args:
+            target_pos: Target position as (x, y) tuple
+            target_radius: Distance at which the target counts as reached
+            target_reward: Base fitness for reaching the target
+            bonus_per_step: Fitness bonus per DNA step left when reached
+            rows: Rockets to evaluate (all by default)
+        """
+        self.store_fitness(rows, compute_fitness(
+            self.pos[rows], self.current_step[rows],
+            self.has_reached_target[rows], self.target_reached_step[rows],
+            self.dna_length, target_pos, target_radius, target_reward, bonus_per_step
+        ))
+
+    def store_fitness(self, rows, result) -> None:
+        """
+        Write a ``compute_fitness`` result back into the selected rows.
+
+        Args:
+            rows: Rockets the result was computed for
+            result: Tuple returned by ``compute_fitness`` for those rows
+        """
+        fitness, reached, step, distance_sq = result
+        self.fitness[rows] = fitness
+        self.distance_sq[rows] = distance_sq
+        self.has_reached_target[rows] = reached
+        self.target_reached_step[rows] = step
+
+    def push_trail(self, rows) -> None:
+        """Append the current position of the selected rockets to their trails."""
+        length = self.trail.shape[1]
+        if length == 0:
+            return
+        head = self.trail_head[rows]
+        self.trail[rows, head] = self.pos[rows]
+        self.trail_head[rows] = (head + 1) % length
+        self.trail_count[rows] = np.minimum(self.trail_count[rows] + 1, length)
+
+    def get_trail(self, index: int) -> np.ndarray:
+        """Get the valid trail positions of one rocket, oldest first."""
+        length = self.trail.shape[1]
+        count = self.trail_count[index]
+        if count < length:
+            # The ring has not wrapped yet, so slots 0..count-1 are in order
+            return self.trail[index, :count]
+        head = self.trail_head[index]
+        return np.concatenate((self.trail[index, head:], self.trail[index, :head]))
+
+
+def compute_fitness(pos, current_step, has_reached_target, target_reached_step,
+                    dna_length, target_pos, target_radius, target_reward, bonus_per_step):
+    """
+    Pure fitness function over plain arrays, shared by the in-process and
+    the multiprocess evaluation paths.
+
+    Args:
+        pos: Positions of shape (n, 2)
+        current_step: Index of the next DNA instruction, shape (n,)
+        has_reached_target: Whether each rocket already reached the target
+        target_reached_step: Step each rocket reached the target at, -1 if not
+        dna_length: Number of thrust instructions per rocket
+        target_pos: Target position as (x, y) tuple
+        target_radius: Distance at which the target counts as reached
+        target_reward: Base fitness for reaching the target
+        bonus_per_step: Fitness bonus per DNA step left when reached
+
+    Returns:
+        Tuple of new (fitness, has_reached_target, target_reached_step,
+        distance_sq) arrays
+    """
+    diff = pos - np.asarray(target_pos, dtype=np.float32)
+    distance_sq = np.einsum('ij,ij->i', diff, diff)
+
+    # Remember the step at which each rocket first reached the target
+    newly_reached = (distance_sq <= target_radius * target_radius) & ~has_reached_target
+    reached = has_reached_target | newly_reached
+    step = np.where(newly_reached, current_step, target_reached_step).astype(np.int32)
+
+    success = np.float32(target_reward) + (dna_length - step).astype(np.float32) * np.float32(bonus_per_step)
+    fitness = np.where(reached, success, np.float32(1.0) / (np.sqrt(distance_sq) + _EPS))
+    return fitness.astype(np.float32, copy=False), reached, step, distance_sq
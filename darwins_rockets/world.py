@@ -1,8 +1,11 @@
 from darwins_rockets.rocket import Entity, Target, Rocket
 from darwins_rockets.population import Population
-import math
+from itertools import chain
 import numpy as np
 
+# Multiplier that packs a (cell_x, cell_y) pair into one sortable int64 key
+_GRID_KEY_STRIDE = 1 << 32
+
 class World:
     def __init__(self, width, height, population_size=50, dna_length=100, mutation_rate=0.1):
         """
@@ -18,7 +21,8 @@ class World:
         # World dimensions and basic properties
         self.width = width
         self.height = height
-        self.entities = []
+        self.rockets = []
+        self.non_rocket_entities = []
         self.target = None
         
         # Genetic algorithm setup
@@ -27,10 +31,7 @@ class World:
         self.mutation_rate = mutation_rate
         
         # Create starting positions for rockets (e.g., bottom center)
-        self.start_positions = [
-            (int((i + 1) * width / (population_size + 1)), height - 50)
-            for i in range(population_size)
-        ]
+        self.start_positions = self._make_start_positions()
         # Initialize population manager
         self.population = Population(
             start_positions=self.start_positions,
@@ -43,6 +44,12 @@ class World:
         self.generation_step = 0
         self.max_steps_per_generation = dna_length + 50  # Allow some extra time
         
+        # Uniform grid over rocket positions, rebuilt on demand after they move
+        self._grid_cell_size = 1.0
+        self._grid_keys = np.empty(0, dtype=np.int64)
+        self._grid_order = np.empty(0, dtype=np.int32)
+        self._grid_dirty = True
+        
         # Performance statistics
         self.stats = {
             'total_rockets_reached_target': 0,
@@ -58,25 +65,64 @@ class World:
         self._spawn_generation()
 
     def add_entity(self, entity: Entity):
-        """Add a non-rocket entity to the world (like targets)."""
-        self.entities.append(entity)
+        """Add an entity to the world (like targets)."""
+        if isinstance(entity, Rocket):
+            self.rockets.append(entity)
+            return
+        self.non_rocket_entities.append(entity)
         if isinstance(entity, Target):
             self.target = entity
 
     def remove_entity(self, entity: Entity):
         """Remove an entity from the world."""
-        if entity in self.entities:
-            self.entities.remove(entity)
+        if entity in self.rockets:
+            self.rockets.remove(entity)
+        elif entity in self.non_rocket_entities:
+            self.non_rocket_entities.remove(entity)
             if entity is self.target:
                 self.target = None
 
+    def _make_start_positions(self):
+        """Spread the rocket start positions evenly along the bottom of the world."""
+        return [
+            (int((i + 1) * self.width / (self.population_size + 1)), self.height - 50)
+            for i in range(self.population_size)
+        ]
+
+    def resize(self, width, height):
+        """
+        Resize the world without restarting the evolution.
+
+        Start positions are laid out for the new size and the current
+        rockets and their trails are scaled along with the world.
+
+        Args:
+            width: New world width in pixels
+            height: New world height in pixels
+        """
+        scale = np.array([width / self.width, height / self.height], dtype=np.float32)
+        self.width = width
+        self.height = height
+        self.start_positions = self._make_start_positions()
+        self.population.start_positions = self.start_positions
+        
+        state = self.population.state
+        state.pos *= scale
+        state.trail *= scale
+        self._grid_dirty = True
+
     def step(self):
         """
         Execute one simulation step. This is the main method called each frame.
         Handles both rocket updates and generation lifecycle management.
         """
-        # Update all entities (rockets and targets)
-        for entity in self.entities:
+        # Advance all rockets at once on the population's shared state
+        # (a single Numba kernel launch when Numba is available)
+        self.population.step_all(self)
+        self._grid_dirty = True
+        
+        # Update the remaining entities; rockets were already stepped above
+        for entity in self.non_rocket_entities:
             entity.update(self)
         
         # Increment generation step counter
@@ -84,6 +130,7 @@ class World:
         
         # Evaluate current generation performance
         self._calculate_rocket_stats()
+        self._update_active_count()
 
         # Check if generation should end
         if self._should_end_generation():
@@ -95,27 +142,25 @@ class World:
         Create a new generation of rockets using DNA from the population.
         This happens at the start of each generation.
         """
-        # Remove all existing rockets from entities
-        self.entities = [e for e in self.entities if not isinstance(e, Rocket)]
+        # Reset the population state from the evolved DNA
+        state = self.population.spawn()
         
-        # Get DNA sequences from population
-        dna_sequences = self.population.get_dnas()
-        
-        # Create new rockets with the DNA
-        for i, (start_pos, dna) in enumerate(zip(self.start_positions, dna_sequences)):
-            rocket = Rocket(start_pos, self.dna_length)
-            # Replace the rocket's random DNA with evolved DNA
-            rocket.dna = [np.array(gene, dtype=float) for gene in dna]
-            rocket.current_step = 0  # Reset step counter
-            self.entities.append(rocket)
+        # Replace the previous rockets with views over the shared population state
+        self.rockets = [
+            Rocket(start_pos, self.dna_length, state=state, index=i)
+            for i, start_pos in enumerate(self.start_positions)
+        ]
         
         # Reset generation tracking
+        self.oob_mask = np.zeros(len(self.rockets), dtype=bool)
+        self.active_count = len(self.rockets)
+        self._grid_dirty = True
         self.generation_step = 0
         self.current_generation += 1
         self.stats['current_generation'] = self.current_generation
         self.stats['generation_complete'] = False
         
-        print(f"Generation {self.current_generation} spawned with {len(self.get_rockets())} rockets")
+        print(f"Generation {self.current_generation} spawned with {len(self.rockets)} rockets")
 
     def _should_end_generation(self):
         """
@@ -134,15 +179,16 @@ class World:
         if self.generation_step >= self.max_steps_per_generation:
             return True
         
-        # End if all rockets have either reached target or are out of fuel
-        all_finished = True
-        for rocket in rockets:
-            # Rocket is still active if it has fuel and hasn't reached target
-            if rocket.current_step < rocket.dna_length and not rocket.has_reached_target:
-                all_finished = False
-                break
-        
-        return all_finished
+        # End if all rockets have either reached target, are out of fuel
+        # or were deactivated (the count is refreshed once per step)
+        return self.active_count == 0
+
+    def _update_active_count(self):
+        """Count the active rockets that still have fuel and haven't reached the target."""
+        state = self.population.state
+        self.active_count = int(np.count_nonzero(
+            state.active & (state.current_step < state.dna_length) & ~state.has_reached_target
+        ))
 
     def _end_generation(self):
         """
@@ -154,15 +200,17 @@ class World:
             print(f"Generation {self.current_generation} ended with no rockets")
             return
         
-        # Ensure all rockets have final fitness calculated
+        # Ensure all rockets have final fitness calculated; large populations
+        # are farmed out to worker processes (master-slave model)
         if self.target:
-            for rocket in rockets:
-                rocket.evaluate_fitness(self.target.pos)
+            self.population.evaluate_parallel(rockets, self.target.pos)
+            # Re-apply the out-of-bounds penalty so selection sees it too
+            self.fitness[self.oob_mask] *= 0.1
         
         # Update all-time best fitness
-        for rocket in rockets:
-            if rocket.fitness > self.stats['best_fitness_all_time']:
-                self.stats['best_fitness_all_time'] = rocket.fitness
+        self.stats['best_fitness_all_time'] = max(
+            self.stats['best_fitness_all_time'], float(self.fitness.max())
+        )
         
         # Evolve population based on rocket performance
         self.population.next_generation(rockets)
@@ -180,42 +228,25 @@ class World:
         Calculate and update statistics for the current generation.
         This runs every step to keep stats current.
         """
-        rockets = [e for e in self.entities if isinstance(e, Rocket)]
-        
-        if not self.target or not rockets:
+        if not self.target or self.pos.size == 0:
             return
         
-        # Reset current generation stats
-        best_dist = float('inf')
-        rockets_reached = 0
-        best_fitness = 0.0
+        # Ensure fitness is calculated for the whole population
+        self.population.evaluate_fitness(self.target.pos)
+        pos = self.pos
+        fitness = self.fitness
         
-        for rocket in rockets:
-            # Ensure fitness is calculated
-            rocket.evaluate_fitness(self.target.pos)
-            
-            # Calculate distance to target
-            dist = math.hypot(
-                rocket.pos[0] - self.target.pos[0], 
-                rocket.pos[1] - self.target.pos[1]
-            )
-            
-            # Update best distance
-            if dist < best_dist:
-                best_dist = dist
-            
-            # Count rockets that reached target
-            if rocket.has_reached_target:
-                rockets_reached += 1
-            
-            # Track best fitness
-            if rocket.fitness > best_fitness:
-                best_fitness = rocket.fitness
-            
-            # Apply out-of-bounds penalty
-            if (rocket.pos[0] < 0 or rocket.pos[0] > self.width or 
-                rocket.pos[1] < 0 or rocket.pos[1] > self.height):
-                rocket.fitness *= 0.1
+        # Reuse the squared distances from the fitness pass; one sqrt for the best
+        best_dist = float(np.sqrt(self.population.state.distance_sq.min()))
+        rockets_reached = int(np.count_nonzero(self.has_reached))
+        best_fitness = max(0.0, float(fitness.max()))
+        
+        # Remember every rocket that has left the world this generation
+        self.oob_mask |= ((pos[:, 0] < 0) | (pos[:, 0] > self.width) |
+                          (pos[:, 1] < 0) | (pos[:, 1] > self.height))
+        
+        # Apply out-of-bounds penalty to the freshly evaluated fitness
+        fitness[self.oob_mask] *= 0.1
         
         # Update statistics
         self.stats['best_distance_achieved'] = best_dist
@@ -226,13 +257,68 @@ class World:
         if rockets_reached > 0:
             self.stats['total_rockets_reached_target'] += rockets_reached
 
+    def _rebuild_grid(self, cell_size):
+        """
+        Bucket the rockets into a uniform grid of square cells.
+
+        Rocket indices are stored sorted by cell key, so the rockets of one
+        cell are a contiguous slice found with a binary search.
+
+        Args:
+            cell_size: Edge length of a grid cell in pixels
+        """
+        cells = np.floor(self.pos / cell_size).astype(np.int64)
+        keys = cells[:, 0] * _GRID_KEY_STRIDE + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        self._grid_cell_size = cell_size
+        self._grid_keys = keys[order]
+        self._grid_order = order.astype(np.int32)
+        self._grid_dirty = False
+
+    def rockets_within(self, center, radius):
+        """
+        Find the rockets within a circle using a uniform grid broadphase.
+
+        Only rockets in the grid cells overlapping the circle's bounding box
+        are distance-tested. The grid is rebuilt first if the rockets have
+        moved, been respawned or rescaled since it was last built.
+
+        Args:
+            center: Circle center as (x, y) tuple
+            radius: Circle radius
+
+        Returns:
+            np.ndarray: Indices of the rockets inside the circle
+        """
+        if self._grid_dirty or self._grid_cell_size != 2 * radius:
+            self._rebuild_grid(2 * radius)
+        cell = self._grid_cell_size
+        x0, x1 = int((center[0] - radius) // cell), int((center[0] + radius) // cell)
+        y0, y1 = int((center[1] - radius) // cell), int((center[1] + radius) // cell)
+        candidates = []
+        for cx in range(x0, x1 + 1):
+            # Cells of one grid column with consecutive y are adjacent keys
+            lo, hi = np.searchsorted(self._grid_keys, (cx * _GRID_KEY_STRIDE + y0,
+                                                        cx * _GRID_KEY_STRIDE + y1 + 1))
+            if hi > lo:
+                candidates.append(self._grid_order[lo:hi])
+        if not candidates:
+            return np.empty(0, dtype=np.int32)
+        idx = np.concatenate(candidates)
+        diff = self.pos[idx] - np.asarray(center, dtype=np.float32)
+        return idx[np.einsum('ij,ij->i', diff, diff) <= radius * radius]
+
     def get_entities(self):
-        """Get all entities in the world."""
-        return list(self.entities)
+        """
+        Iterate over all entities in the world without copying them.
+
+        Callers must not add or remove entities while iterating.
+        """
+        return chain(self.rockets, self.non_rocket_entities)
 
     def get_rockets(self):
         """Get only the rocket entities."""
-        return [e for e in self.entities if isinstance(e, Rocket)]
+        return self.rockets
 
     def get_stats(self):
         """Get current performance statistics."""
@@ -240,7 +326,7 @@ class World:
 
     def get_state(self):
         """Get the state of all entities for visualization."""
-        return [entity.get_state() for entity in self.entities]
+        return [entity.get_state() for entity in self.get_entities()]
 
     def is_generation_complete(self):
         """Check if the current generation has finished."""
@@ -291,6 +377,31 @@ class World:
         
         print(f"Mutation rate updated to: {new_rate:.3f}")
 
+    @property
+    def pos(self):
+        """Positions of the current generation's rockets, shape (N, 2)."""
+        return self.population.state.pos
+
+    @property
+    def vel(self):
+        """Velocities of the current generation's rockets, shape (N, 2)."""
+        return self.population.state.vel
+
+    @property
+    def fitness(self):
+        """Fitness of the current generation's rockets, shape (N,)."""
+        return self.population.state.fitness
+
+    @property
+    def has_reached(self):
+        """Whether each rocket has reached the target, set by the squared-distance pass."""
+        return self.population.state.has_reached_target
+
+    @property
+    def dna_arr(self):
+        """DNA of the current generation's rockets, shape (N, L, 2) float32."""
+        return self.population.state.dna
+
     @property
     def target_pos(self):
         if self.target is not None: